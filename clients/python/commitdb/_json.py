@@ -0,0 +1,9 @@
+"""JSON parser shared by the network client and the embedded bindings."""
+
+try:
+    # Optional fast path: pip install commitdb[fast]
+    from orjson import JSONDecodeError, loads
+except ImportError:
+    from json import JSONDecodeError, loads  # type: ignore[assignment]
+
+__all__ = ['JSONDecodeError', 'loads']
@@ -3,12 +3,13 @@ Python ctypes bindings for libcommitdb shared library.
 """
 
 import ctypes
-import json
 import os
 import platform
 from pathlib import Path
 from typing import Optional
 
+from . import _json
+
 
 def _find_library() -> Optional[str]:
     """Find the libcommitdb shared library."""
@@ -24,20 +25,25 @@ def _find_library() -> Optional[str]:
         lib_names = ['libcommitdb.so', 'libcommitdb.dylib']
     
     # Search paths
+    package_dir = Path(__file__).resolve().parent
     search_paths = [
-        Path(__file__).parent / 'lib',  # Package lib directory (for pip installed)
-        Path(__file__).parent,  # Same directory as this file
-        Path(__file__).parent.parent / 'lib',  # clients/python/lib
-        Path(__file__).parent.parent.parent.parent / 'lib',  # CommitDB/lib
+        package_dir / 'lib',  # Package lib directory (for pip installed)
+        package_dir,  # Same directory as this file
+        package_dir.parent / 'lib',  # clients/python/lib
+        package_dir.parents[2] / 'lib',  # CommitDB/lib
         Path.cwd() / 'lib',  # ./lib
         Path.cwd(),  # Current directory
     ]
     
+    # One directory listing per path instead of a stat per candidate name
     for path in search_paths:
+        try:
+            entries = set(os.listdir(path))
+        except OSError:
+            continue
         for lib_name in lib_names:
-            lib_path = path / lib_name
-            if lib_path.exists():
-                return str(lib_path)
+            if lib_name in entries:
+                return str(path / lib_name)
     
     return None
 
@@ -128,8 +134,7 @@ class CommitDBBinding:
             result_str = ctypes.cast(result_ptr, ctypes.c_char_p).value
             if result_str is None:
                 raise RuntimeError("Empty response from query")
-            result_json = result_str.decode('utf-8')
-            return json.loads(result_json)
+            return _json.loads(result_str)
         finally:
             # Free the allocated memory using the void pointer
             cls._lib.commitdb_free(result_ptr)
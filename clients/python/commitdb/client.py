@@ -2,11 +2,27 @@
 CommitDB Client - Python Client for CommitDB SQL Server.
 """
 
-import json
 import socket
 import ssl
-from dataclasses import dataclass, field
-from typing import Iterator, Optional, Union
+from collections import namedtuple
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Union
+
+from . import _json
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Size of a single socket read; large results arrive in many of these.
+_RECV_CHUNK = 64 * 1024
+
+# Bytes of queries execute_many writes before reading their responses. The
+# server stops reading while its replies go unread, so an unbounded batch
+# would leave both ends blocked on full socket buffers.
+_PIPELINE_WINDOW = 64 * 1024
 
 
 class CommitDBError(Exception):
@@ -14,19 +30,33 @@ class CommitDBError(Exception):
     pass
 
 
-@dataclass
+@lru_cache(maxsize=128)
+def _row_type(columns: tuple[str, ...]) -> Any:
+    """Named tuple type for a set of columns, built once per column set."""
+    return namedtuple('Row', columns, rename=True)
+
+
+@dataclass(slots=True)
 class QueryResult:
     """Result from a SELECT query."""
-    columns: list[str]
-    data: list[list[str]]
-    records_read: int
-    execution_time_ms: float
+    columns: list[str] = field(default_factory=list)
+    data: list[list[str]] = field(default_factory=list)
+    records_read: int = 0
+    execution_time_ms: float = 0.0
     execution_ops: int = 0
 
     def __iter__(self) -> Iterator[dict[str, str]]:
         """Iterate over rows as dictionaries."""
-        for row in self.data:
-            yield dict(zip(self.columns, row))
+        return map(dict, map(zip, repeat(tuple(self.columns)), self.data))
+
+    def itertuples(self) -> Iterator[tuple]:
+        """
+        Iterate over rows as named tuples.
+
+        Cheaper than dictionaries for large results. Column names that are not
+        valid identifiers (e.g. 'UPPER(name)') are renamed positionally (_0, _1, ...).
+        """
+        return map(_row_type(tuple(self.columns))._make, self.data)
 
     def __len__(self) -> int:
         return len(self.data)
@@ -34,8 +64,49 @@ class QueryResult:
     def __getitem__(self, index: int) -> dict[str, str]:
         return dict(zip(self.columns, self.data[index]))
 
+    def column(self, key: Union[int, str]) -> list[str]:
+        """
+        Get all values of a single column.
+
+        Args:
+            key: Column index or column name
+
+        Raises:
+            ValueError: If a column name is not in the result
+            IndexError: If a column index is out of range
+        """
+        if isinstance(key, str):
+            index = self.columns.index(key)
+        elif -len(self.columns) <= key < len(self.columns):
+            index = key
+        else:
+            raise IndexError(f"column index {key} out of range")
+        if not self.data:
+            return []
+        return list(map(itemgetter(index), self.data))
+
+    @property
+    def columns_data(self) -> list[list[str]]:
+        """
+        Column-major copy of data, one list of values per column.
+
+        A fresh transpose of the whole result is built on every access; use
+        column() when only one column is needed, or keep a reference.
+        """
+        if not self.data:
+            return [[] for _ in self.columns]
+        return list(map(list, zip(*self.data)))
+
+    def to_arrow(self) -> 'pa.Table':
+        """Convert to a pyarrow Table (requires pyarrow)."""
+        import pyarrow as pa
+        return pa.Table.from_arrays(
+            [pa.array(values, type=pa.string()) for values in self.columns_data],
+            names=self.columns
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class CommitResult:
     """Result from a mutation operation (INSERT, UPDATE, DELETE, CREATE, DROP)."""
     databases_created: int = 0
@@ -55,6 +126,64 @@ class CommitResult:
                 self.records_written + self.records_deleted)
 
 
+def _encode_query(query: str) -> bytes:
+    """
+    Encode a query as a single newline-terminated line.
+
+    Raises:
+        CommitDBError: If a string literal contains a newline
+    """
+    # The server reads one query per line, so a multi-line statement
+    # would be executed piecemeal and desync the responses
+    if '\n' in query:
+        # Splitting on quotes puts literal contents at odd indices; a doubled
+        # quote only adds an empty part, so the parity still holds
+        parts = query.split("'")
+        if any('\n' in part for part in parts[1::2]):
+            raise CommitDBError("String literals cannot contain newlines")
+        parts[0::2] = [part.replace('\n', ' ') for part in parts[0::2]]
+        query = "'".join(parts)
+    return (query + '\n').encode('utf-8')
+
+
+def _sql_literal(value) -> str:
+    """Format a Python value as a SQL literal, quoting strings."""
+    if isinstance(value, str):
+        # The lexer reads a doubled quote as a literal quote; backslashes are not special
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+def _insert_sql(database: str, table: str, columns: list[str], rows: list[list]) -> str:
+    """Build a single INSERT statement for one or more rows."""
+    cols = ', '.join(columns)
+    vals = ', '.join('(' + ', '.join(map(_sql_literal, row)) + ')' for row in rows)
+    return f'INSERT INTO {database}.{table} ({cols}) VALUES {vals}'
+
+
+# Response keys that map onto result constructor arguments
+_QUERY_FIELDS = frozenset(f.name for f in fields(QueryResult))
+_COMMIT_FIELDS = frozenset(f.name for f in fields(CommitResult))
+
+
+def _parse_response(response: dict) -> CommitResult | QueryResult:
+    """Parse a response dict into result objects."""
+    if not response.get('success'):
+        raise CommitDBError(response.get('error', 'Unknown error'))
+
+    result_type = response.get('type')
+    result_data = response.get('result', {})
+
+    # Fields the server omits fall back to the dataclass defaults
+    if result_type == 'query':
+        return QueryResult(**{k: v for k, v in result_data.items() if k in _QUERY_FIELDS})
+    elif result_type == 'commit':
+        return CommitResult(**{k: v for k, v in result_data.items() if k in _COMMIT_FIELDS})
+    else:
+        # Unknown type, return empty commit result
+        return CommitResult()
+
+
 class CommitDB:
     """
     CommitDB Python client.
@@ -85,10 +214,17 @@ class CommitDB:
         db.close()
     """
 
+    # Short statements (SHOW TABLES IN x, lookups by key) tend to repeat, so each
+    # connection caches their encoded form; longer ones are mostly one-off bulk
+    # INSERTs and are encoded directly
+    _ENCODE_CACHE_MAX_LEN = 4096
+
     def __init__(self, host: str = 'localhost', port: int = 3306, 
                  jwt_token: Optional[str] = None,
                  use_ssl: bool = False, ssl_verify: bool = True,
-                 ssl_ca_cert: Optional[str] = None):
+                 ssl_ca_cert: Optional[str] = None, nodelay: bool = True,
+                 keepalive: bool = True, recv_buffer_size: Optional[int] = None,
+                 send_buffer_size: Optional[int] = None):
         """
         Initialize CommitDB client.
 
@@ -99,6 +235,14 @@ class CommitDB:
             use_ssl: Enable SSL/TLS encryption
             ssl_verify: Verify server certificate (default True)
             ssl_ca_cert: Path to CA certificate file for verification
+            nodelay: Disable Nagle's algorithm (TCP_NODELAY) so small queries
+                are sent immediately (default True)
+            keepalive: Enable TCP keepalive so dead peers on idle connections
+                are detected (default True)
+            recv_buffer_size: Optional SO_RCVBUF size in bytes for large results
+                (default: kernel auto-tuning)
+            send_buffer_size: Optional SO_SNDBUF size in bytes for large inserts
+                (default: kernel auto-tuning)
         """
         self.host = host
         self.port = port
@@ -106,8 +250,17 @@ class CommitDB:
         self.use_ssl = use_ssl
         self.ssl_verify = ssl_verify
         self.ssl_ca_cert = ssl_ca_cert
+        self.nodelay = nodelay
+        self.keepalive = keepalive
+        self.recv_buffer_size = recv_buffer_size
+        self.send_buffer_size = send_buffer_size
         self._socket: Optional[socket.socket] = None
-        self._buffer = b''
+        self._buffer = bytearray()
+        self._scan_from = 0  # Bytes of _buffer already searched for a newline
+        self._recv_buf = memoryview(bytearray(_RECV_CHUNK))
+        # Cleared on close, since statements can carry credentials
+        # (AUTH JWT, share tokens, COPY INTO secrets)
+        self._encode_cached = lru_cache(maxsize=256)(_encode_query)
         self._authenticated = False
         self._identity: Optional[str] = None
 
@@ -122,7 +275,10 @@ class CommitDB:
             self for method chaining
         """
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._buffer.clear()
+        self._scan_from = 0
         self._socket.settimeout(timeout)
+        self._configure_socket(self._socket)
         self._socket.connect((self.host, self.port))
         
         # Wrap with SSL if enabled
@@ -141,6 +297,21 @@ class CommitDB:
         
         return self
 
+    def _configure_socket(self, sock: socket.socket) -> None:
+        """Apply socket options; buffer sizes must be set before connecting."""
+        if self.nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.keepalive:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # Probe after 60s idle, every 10s, give up after 3 misses (where supported)
+            for option, value in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3)):
+                if hasattr(socket, option):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+        if self.recv_buffer_size:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.recv_buffer_size)
+        if self.send_buffer_size:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+
     def authenticate_jwt(self, token: str) -> dict:
         """
         Authenticate with a JWT token.
@@ -177,9 +348,10 @@ class CommitDB:
 
     def close(self) -> None:
         """Close the connection."""
+        self._encode_cached.cache_clear()
         if self._socket:
             try:
-                self._socket.send(b'quit\n')
+                self._socket.sendall(b'quit\n')
             except Exception:
                 pass
             self._socket.close()
@@ -191,28 +363,45 @@ class CommitDB:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.close()
 
+    def _encode(self, query: str) -> bytes:
+        """Encode a query as a single newline-terminated line."""
+        if len(query) < self._ENCODE_CACHE_MAX_LEN:
+            return self._encode_cached(query)
+        return _encode_query(query)
+
     def _send(self, query: str) -> dict:
         """Send a query and receive the response."""
         if not self._socket:
             raise CommitDBError("Not connected. Call connect() first.")
 
-        # Send query with newline
-        self._socket.send((query + '\n').encode('utf-8'))
+        self._socket.sendall(self._encode(query))
+        return self._recv()
+
+    def _recv(self) -> dict:
+        """Receive the next response from the server."""
+        if not self._socket:
+            raise CommitDBError("Not connected. Call connect() first.")
 
-        # Read response until newline
-        while b'\n' not in self._buffer:
-            chunk = self._socket.recv(4096)
-            if not chunk:
+        # Read response until newline, only scanning newly received bytes
+        buffer = self._buffer
+        idx = buffer.find(b'\n', self._scan_from)
+        while idx < 0:
+            self._scan_from = len(buffer)
+            n = self._socket.recv_into(self._recv_buf)
+            if not n:
                 raise CommitDBError("Connection closed by server")
-            self._buffer += chunk
+            buffer += self._recv_buf[:n]
+            idx = buffer.find(b'\n', self._scan_from)
 
         # Split at first newline
-        line, self._buffer = self._buffer.split(b'\n', 1)
+        line = buffer[:idx]
+        del buffer[:idx + 1]
+        self._scan_from = 0
 
-        # Parse JSON response
+        # Parse JSON response (both parsers accept UTF-8 bytes directly)
         try:
-            return json.loads(line.decode('utf-8'))
-        except json.JSONDecodeError as e:
+            return _json.loads(line)
+        except _json.JSONDecodeError as e:
             raise CommitDBError(f"Invalid response from server: {e}")
 
     def execute(self, query: str) -> CommitResult | QueryResult:
@@ -225,36 +414,57 @@ class CommitDB:
         Returns:
             QueryResult for SELECT queries, CommitResult for mutations
         """
-        response = self._send(query)
+        return _parse_response(self._send(query))
 
-        if not response.get('success'):
-            raise CommitDBError(response.get('error', 'Unknown error'))
-
-        result_type = response.get('type')
-        result_data = response.get('result', {})
-
-        if result_type == 'query':
-            return QueryResult(
-                columns=result_data.get('columns', []),
-                data=result_data.get('data', []),
-                records_read=result_data.get('records_read', 0),
-                execution_time_ms=result_data.get('execution_time_ms', 0.0),
-                execution_ops=result_data.get('execution_ops', 0)
-            )
-        elif result_type == 'commit':
-            return CommitResult(
-                databases_created=result_data.get('databases_created', 0),
-                databases_deleted=result_data.get('databases_deleted', 0),
-                tables_created=result_data.get('tables_created', 0),
-                tables_deleted=result_data.get('tables_deleted', 0),
-                records_written=result_data.get('records_written', 0),
-                records_deleted=result_data.get('records_deleted', 0),
-                execution_time_ms=result_data.get('execution_time_ms', 0.0),
-                execution_ops=result_data.get('execution_ops', 0)
-            )
-        else:
-            # Unknown type, return empty commit result
-            return CommitResult()
+    def execute_many(self, queries: list[str]) -> list[CommitResult | QueryResult]:
+        """
+        Execute several SQL queries, pipelined in bounded windows.
+
+        Queries are written in windows of up to 64 KiB and each window's
+        responses are read back before the next is sent, so results line up
+        with queries. The server runs every query even if an earlier one
+        fails; the first error is raised once all responses have been read.
+
+        Args:
+            queries: SQL queries to execute, in order
+
+        Returns:
+            One QueryResult or CommitResult per query
+
+        Raises:
+            CommitDBError: If any query cannot be sent (empty, quit/exit, or a
+                newline inside a string literal); nothing is sent in that case
+        """
+        if not self._socket:
+            raise CommitDBError("Not connected. Call connect() first.")
+        if not queries:
+            return []
+
+        # Validate and encode the whole batch first so a bad query cannot
+        # surface after earlier windows have already run
+        for query in queries:
+            if query.strip().lower() in ('', 'quit', 'exit'):
+                raise CommitDBError(f"Cannot pipeline {query!r}: the server does not answer it")
+        batch = [self._encode(query) for query in queries]
+
+        responses: list[dict] = []
+        window: list[bytes] = []
+        window_size = 0
+        for encoded in batch:
+            window.append(encoded)
+            window_size += len(encoded)
+            if window_size >= _PIPELINE_WINDOW:
+                self._send_window(self._socket, window, responses)
+                window = []
+                window_size = 0
+        if window:
+            self._send_window(self._socket, window, responses)
+        return [_parse_response(response) for response in responses]
+
+    def _send_window(self, sock: socket.socket, window: list[bytes], responses: list[dict]) -> None:
+        """Write a window of encoded queries and read one response for each."""
+        sock.sendall(b''.join(window))
+        responses.extend(self._recv() for _ in window)
 
     def query(self, sql: str) -> QueryResult:
         """
@@ -309,28 +519,37 @@ class CommitDB:
             columns: List of column names
             values: List of values (strings will be quoted)
         """
-        cols = ', '.join(columns)
-        vals = ', '.join(
-            f"'{v}'" if isinstance(v, str) else str(v)
-            for v in values
-        )
-        result = self.execute(f'INSERT INTO {database}.{table} ({cols}) VALUES ({vals})')
+        return self.insert_many(database, table, columns, [values])
+
+    def insert_many(self, database: str, table: str, columns: list[str],
+                    rows: list[list]) -> CommitResult:
+        """
+        Insert multiple rows with a single INSERT statement.
+
+        Args:
+            database: Database name
+            table: Table name
+            columns: List of column names
+            rows: List of rows, each a list of values (strings will be quoted)
+        """
+        if not rows:
+            return CommitResult()
+        result = self.execute(_insert_sql(database, table, columns, rows))
         if not isinstance(result, CommitResult):
             raise CommitDBError("Expected commit result")
         return result
 
     def show_databases(self) -> list[str]:
         """List all databases."""
-        result = self.query('SHOW DATABASES')
-        return [row[0] for row in result.data] if result.data else []
+        return self.query('SHOW DATABASES').column(0)
 
     def show_tables(self, database: str) -> list[str]:
         """List all tables in a database."""
-        result = self.query(f'SHOW TABLES IN {database}')
-        return [row[0] for row in result.data] if result.data else []
+        return self.query(f'SHOW TABLES IN {database}').column(0)
 
-    def create_share(self, name: str, url: str, token: str = None,
-                     ssh_key: str = None, passphrase: str = None) -> CommitResult:
+    def create_share(self, name: str, url: str, token: Optional[str] = None,
+                     ssh_key: Optional[str] = None,
+                     passphrase: Optional[str] = None) -> CommitResult | QueryResult:
         """
         Create a share from an external Git repository.
 
@@ -354,8 +573,9 @@ class CommitDB:
                 query += f" PASSPHRASE '{passphrase}'"
         return self.execute(query)
 
-    def sync_share(self, name: str, token: str = None,
-                   ssh_key: str = None, passphrase: str = None) -> CommitResult:
+    def sync_share(self, name: str, token: Optional[str] = None,
+                   ssh_key: Optional[str] = None,
+                   passphrase: Optional[str] = None) -> CommitResult | QueryResult:
         """
         Synchronize a share with its remote repository.
 
@@ -374,7 +594,7 @@ class CommitDB:
                 query += f" PASSPHRASE '{passphrase}'"
         return self.execute(query)
 
-    def drop_share(self, name: str) -> CommitResult:
+    def drop_share(self, name: str) -> CommitResult | QueryResult:
         """Drop a share."""
         return self.execute(f"DROP SHARE {name}")
 
@@ -440,36 +660,6 @@ class CommitDBLocal:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.close()
 
-    def _parse_response(self, response: dict) -> CommitResult | QueryResult:
-        """Parse a response dict into result objects."""
-        if not response.get('success'):
-            raise CommitDBError(response.get('error', 'Unknown error'))
-
-        result_type = response.get('type')
-        result_data = response.get('result', {})
-
-        if result_type == 'query':
-            return QueryResult(
-                columns=result_data.get('columns', []),
-                data=result_data.get('data', []),
-                records_read=result_data.get('records_read', 0),
-                execution_time_ms=result_data.get('execution_time_ms', 0.0),
-                execution_ops=result_data.get('execution_ops', 0)
-            )
-        elif result_type == 'commit':
-            return CommitResult(
-                databases_created=result_data.get('databases_created', 0),
-                databases_deleted=result_data.get('databases_deleted', 0),
-                tables_created=result_data.get('tables_created', 0),
-                tables_deleted=result_data.get('tables_deleted', 0),
-                records_written=result_data.get('records_written', 0),
-                records_deleted=result_data.get('records_deleted', 0),
-                execution_time_ms=result_data.get('execution_time_ms', 0.0),
-                execution_ops=result_data.get('execution_ops', 0)
-            )
-        else:
-            return CommitResult()
-
     def execute(self, query: str) -> CommitResult | QueryResult:
         """
         Execute a SQL query.
@@ -484,7 +674,19 @@ class CommitDBLocal:
             raise CommitDBError("Database not open. Call open() first.")
         
         response = self._binding.execute(self._handle, query)
-        return self._parse_response(response)
+        return _parse_response(response)
+
+    def execute_many(self, queries: list[str]) -> list[CommitResult | QueryResult]:
+        """
+        Execute several SQL queries in order.
+
+        As with CommitDB.execute_many, every query is run even if an earlier
+        one fails; the first error is raised once all have been run.
+        """
+        if self._handle is None:
+            raise CommitDBError("Database not open. Call open() first.")
+        responses = [self._binding.execute(self._handle, query) for query in queries]
+        return [_parse_response(response) for response in responses]
 
     def query(self, sql: str) -> QueryResult:
         """Execute a SELECT query and return results."""
@@ -509,12 +711,14 @@ class CommitDBLocal:
 
     def insert(self, database: str, table: str, columns: list[str], values: list) -> CommitResult:
         """Insert a row."""
-        cols = ', '.join(columns)
-        vals = ', '.join(
-            f"'{v}'" if isinstance(v, str) else str(v)
-            for v in values
-        )
-        result = self.execute(f'INSERT INTO {database}.{table} ({cols}) VALUES ({vals})')
+        return self.insert_many(database, table, columns, [values])
+
+    def insert_many(self, database: str, table: str, columns: list[str],
+                    rows: list[list]) -> CommitResult:
+        """Insert multiple rows with a single INSERT statement."""
+        if not rows:
+            return CommitResult()
+        result = self.execute(_insert_sql(database, table, columns, rows))
         if not isinstance(result, CommitResult):
             raise CommitDBError("Expected commit result")
         return result
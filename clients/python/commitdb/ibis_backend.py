@@ -231,7 +231,7 @@ class Backend(SQLBackend):
         """List all databases."""
         client = self._ensure_connected()
         result = client.query("SHOW DATABASES")
-        databases = [row[0] for row in result.data]
+        databases = result.column(0)
         return self._filter_with_like(databases, like)
     
     def list_tables(
@@ -244,7 +244,7 @@ class Backend(SQLBackend):
             raise CommitDBError("No database specified. Use database parameter or set current_database.")
         
         result = client.query(f"SHOW TABLES IN {db}")
-        tables = [row[0] for row in result.data]
+        tables = result.column(0)
         return self._filter_with_like(tables, like)
     
     def _parse_type(self, type_str: str) -> dt.DataType:
@@ -0,0 +1,44 @@
+"""Shared pytest fixtures for the CommitDB Python client tests.
+
+The unit tests share no state, so they can run in parallel with
+pytest-xdist (``pytest -n auto``). Session-scoped fixtures are then
+built once per worker; keep them free of anything that must be global,
+and avoid module-level side effects in the test modules.
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="run tests marked integration (requires a running server)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "integration: requires a running CommitDB server"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-integration"):
+        return
+    skip = pytest.mark.skip(reason="needs --run-integration")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def all_entry_points():
+    """Installed entry points, read once per session.
+
+    importlib.metadata rereads each distribution's metadata from disk on
+    every lookup, so tests select groups from this snapshot instead.
+    """
+    from importlib.metadata import entry_points
+    return entry_points()
@@ -3,53 +3,106 @@ Tests for CommitDB Python Client.
 
 To run with a live server:
     1. Start the server: go run ./cmd/server
-    2. Run tests: pytest clients/python/tests/
+    2. Run tests: pytest clients/python/tests/ --run-integration
 """
 
+import re
+import socket
+import threading
+import time
+import uuid
+
 import pytest
 from commitdb import CommitDB, QueryResult, CommitResult, CommitDBError
 
+NOT_CONNECTED_RE = re.compile("Not connected")
+
+EXPECTED_ROWS = [
+    {'id': '1', 'name': 'Alice'},
+    {'id': '2', 'name': 'Bob'},
+]
+
+
+def as_dict(row):
+    """Normalize a result row, whether a mapping or a namedtuple, to a dict."""
+    return row._asdict() if hasattr(row, '_asdict') else dict(row)
+
+
+@pytest.fixture
+def two_row_result():
+    return QueryResult(
+        columns=['id', 'name'],
+        data=[['1', 'Alice'], ['2', 'Bob']],
+        records_read=2,
+        execution_time_ms=1.0
+    )
+
 
 class TestQueryResult:
     """Tests for QueryResult class."""
 
-    def test_iteration(self):
+    @pytest.mark.parametrize("op,expected", [
+        (lambda r: [as_dict(row) for row in r], EXPECTED_ROWS),
+        (len, 2),
+        (lambda r: as_dict(r[0]), EXPECTED_ROWS[0]),
+        (lambda r: as_dict(r[1]), EXPECTED_ROWS[1]),
+        (lambda r: as_dict(r[-1]), EXPECTED_ROWS[-1]),
+    ], ids=['iter', 'len', 'getitem0', 'getitem1', 'getitem-1'])
+    def test_row_access(self, two_row_result, op, expected):
+        assert op(two_row_result) == expected
+
+    def test_iteration_columnar(self, two_row_result):
+        # Column access must agree with the row view without building dicts
+        for name in two_row_result.columns:
+            assert two_row_result.column(name) == [row[name] for row in EXPECTED_ROWS]
+
+    def test_itertuples(self):
         result = QueryResult(
-            columns=['id', 'name'],
-            data=[['1', 'Alice'], ['2', 'Bob']],
+            columns=['id', 'UPPER(name)'],
+            data=[['1', 'ALICE'], ['2', 'BOB']],
             records_read=2,
             execution_time_ms=1.0
         )
 
-        rows = list(result)
-        assert rows == [
-            {'id': '1', 'name': 'Alice'},
-            {'id': '2', 'name': 'Bob'}
-        ]
+        rows = list(result.itertuples())
+        assert rows == [('1', 'ALICE'), ('2', 'BOB')]
+        assert rows[1].id == '2'
+        assert rows[1]._1 == 'BOB'
 
-    def test_len(self):
-        result = QueryResult(
-            columns=['id'],
-            data=[['1'], ['2'], ['3']],
-            records_read=3,
-            execution_time_ms=1.0
-        )
-        assert len(result) == 3
+    def test_column(self, two_row_result):
+        assert two_row_result.column(0) == ['1', '2']
+        assert two_row_result.column('name') == ['Alice', 'Bob']
+        with pytest.raises(ValueError):
+            two_row_result.column('missing')
+        with pytest.raises(IndexError):
+            two_row_result.column(2)
+        with pytest.raises(IndexError):
+            QueryResult(columns=['id'], data=[]).column(1)
 
-    def test_getitem(self):
-        result = QueryResult(
-            columns=['id', 'name'],
-            data=[['1', 'Alice'], ['2', 'Bob']],
-            records_read=2,
-            execution_time_ms=1.0
-        )
-        assert result[0] == {'id': '1', 'name': 'Alice'}
-        assert result[1] == {'id': '2', 'name': 'Bob'}
+    def test_columns_data(self, two_row_result):
+        assert two_row_result.columns_data == [['1', '2'], ['Alice', 'Bob']]
+        two_row_result.data.append(['3', 'Carol'])
+        assert two_row_result.columns_data == [['1', '2', '3'], ['Alice', 'Bob', 'Carol']]
+
+        empty = QueryResult(columns=['id'], data=[], records_read=0, execution_time_ms=1.0)
+        assert empty.columns_data == [[]]
+
+    def test_to_arrow(self, two_row_result):
+        pytest.importorskip("pyarrow")
+        table = two_row_result.to_arrow()
+        assert table.column_names == ['id', 'name']
+        assert table.column('name').to_pylist() == ['Alice', 'Bob']
 
 
 class TestCommitResult:
     """Tests for CommitResult class."""
 
+    def test_slots(self):
+        result = CommitResult()
+        assert not hasattr(result, '__dict__')
+        with pytest.raises(AttributeError):
+            result.unknown_field = 1
+
     def test_affected_rows(self):
         result = CommitResult(
             databases_created=1,
@@ -64,13 +117,33 @@ class TestCommitResult:
         assert result.execution_time_ms == 0.0
 
 
+@pytest.fixture
+def unconnected_db():
+    return CommitDB('localhost', 3306)
+
+
 class TestCommitDBUnit:
     """Unit tests for CommitDB client (no server required)."""
 
-    def test_init(self):
-        db = CommitDB('localhost', 3306)
-        assert db.host == 'localhost'
-        assert db.port == 3306
+    @pytest.mark.parametrize("host,port", [
+        ('localhost', 3306),
+        ('127.0.0.1', 3307),
+    ])
+    def test_init(self, host, port):
+        db = CommitDB(host, port)
+        assert db.host == host
+        assert db.port == port
+
+    def test_encode_query(self, unconnected_db):
+        db = unconnected_db
+        assert db._encode('SHOW DATABASES') == b'SHOW DATABASES\n'
+        long_query = 'SELECT ' + 'x' * 5000
+        assert db._encode(long_query) == long_query.encode('utf-8') + b'\n'
+
+    def test_close_forgets_encoded_queries(self, unconnected_db):
+        unconnected_db._encode('AUTH JWT some.jwt.token')
+        unconnected_db.close()
+        assert unconnected_db._encode_cached.cache_info().currsize == 0
 
     def test_init_with_jwt_token(self):
         db = CommitDB('localhost', 3306, jwt_token='test.jwt.token')
@@ -78,30 +151,268 @@ class TestCommitDBUnit:
         assert db.authenticated is False
         assert db.identity is None
 
-    def test_not_connected_error(self):
-        db = CommitDB('localhost', 3306)
-        with pytest.raises(CommitDBError, match="Not connected"):
-            db.execute("SELECT 1")
+    def test_not_connected_error(self, unconnected_db):
+        with pytest.raises(CommitDBError, match=NOT_CONNECTED_RE):
+            unconnected_db.execute("SELECT 1")
 
-    def test_auth_not_connected_error(self):
-        db = CommitDB('localhost', 3306)
-        with pytest.raises(CommitDBError, match="Not connected"):
-            db.authenticate_jwt("some.jwt.token")
+    def test_auth_not_connected_error(self, unconnected_db):
+        with pytest.raises(CommitDBError, match=NOT_CONNECTED_RE):
+            unconnected_db.authenticate_jwt("some.jwt.token")
+
+
+class FakeServer:
+    """Loopback server that answers each query line with the next canned reply."""
+
+    def __init__(self, replies, chunk_size=None):
+        self.replies = list(replies)
+        self.chunk_size = chunk_size
+        self.queries = []
+        self._sock = socket.create_server(('127.0.0.1', 0))
+        self.port = self._sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        conn, _ = self._sock.accept()
+        with conn, conn.makefile('rb') as reader:
+            for line in reader:
+                self.queries.append(line.rstrip(b'\n').decode('utf-8'))
+                if self.replies:
+                    self._reply(conn, self.replies.pop(0))
+
+    def _reply(self, conn, reply):
+        if not self.chunk_size:
+            conn.sendall(reply)
+            return
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        for i in range(0, len(reply), self.chunk_size):
+            conn.sendall(reply[i:i + self.chunk_size])
+            time.sleep(0.001)
 
+    def close(self):
+        self._sock.close()
 
-# Integration tests require a running server
-# These run automatically in CI where the server is started
+
+@pytest.fixture
+def fake_server():
+    servers = []
+
+    def start(*replies, chunk_size=None):
+        server = FakeServer(replies, chunk_size)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+QUERY_REPLY = (b'{"success":true,"type":"query","result":{"columns":["id","name"],'
+               b'"data":[["1","Alice"],["2","Bob"]],"records_read":2,"execution_time_ms":0.5}}\n')
+
+
+class TestCommitDBProtocol:
+    """Wire protocol tests against a loopback fake server."""
+
+    def test_query_response(self, fake_server):
+        server = fake_server(QUERY_REPLY)
+        with CommitDB('127.0.0.1', server.port) as db:
+            result = db.query('SELECT * FROM mydb.users')
+        assert server.queries[0] == 'SELECT * FROM mydb.users'
+        assert result.columns == ['id', 'name']
+        assert result[1] == {'id': '2', 'name': 'Bob'}
+
+    def test_fragmented_response(self, fake_server):
+        server = fake_server(QUERY_REPLY, chunk_size=7)
+        with CommitDB('127.0.0.1', server.port) as db:
+            result = db.query('SELECT * FROM mydb.users')
+        assert result[0] == {'id': '1', 'name': 'Alice'}
+
+    def test_responses_in_one_read(self, fake_server):
+        commit = b'{"success":true,"type":"commit","result":{"records_written":1,"execution_time_ms":0.1}}\n'
+        server = fake_server(commit + QUERY_REPLY, b'')
+        with CommitDB('127.0.0.1', server.port) as db:
+            assert db.execute("INSERT INTO mydb.users (id) VALUES (3)").records_written == 1
+            # The second response is already buffered and must not be lost
+            assert len(db.query('SELECT * FROM mydb.users')) == 2
+
+    def test_multiline_query(self, fake_server):
+        server = fake_server(QUERY_REPLY)
+        with CommitDB('127.0.0.1', server.port) as db:
+            db.query("""
+                SELECT *
+                FROM mydb.users
+            """)
+        assert server.queries[0].split() == ['SELECT', '*', 'FROM', 'mydb.users']
+
+    def test_newline_in_literal(self, fake_server):
+        commit = b'{"success":true,"type":"commit","result":{"records_written":1,"execution_time_ms":0.1}}\n'
+        server = fake_server(commit, commit)
+        with CommitDB('127.0.0.1', server.port) as db:
+            # Newlines around literals are folded; those inside are left alone
+            db.execute("INSERT INTO mydb.users (id, name)\nVALUES (1, 'O''Brien\tJr')")
+            with pytest.raises(CommitDBError, match="newlines"):
+                db.insert('mydb', 'users', ['id', 'name'], [2, 'line1\nline2'])
+            # Nothing was sent for the rejected statement
+            assert db.execute("INSERT INTO mydb.users (id) VALUES (3)").records_written == 1
+        assert server.queries[0] == "INSERT INTO mydb.users (id, name) VALUES (1, 'O''Brien\tJr')"
+        assert server.queries[1] == "INSERT INTO mydb.users (id) VALUES (3)"
+
+    def test_large_response(self, fake_server):
+        rows = ','.join(f'["{i}","user{i}"]' for i in range(10000))
+        reply = ('{"success":true,"type":"query","result":{"columns":["id","name"],'
+                 f'"data":[{rows}],"records_read":10000,"execution_time_ms":1.0}}}}\n')
+        server = fake_server(reply.encode('utf-8'), QUERY_REPLY)
+        with CommitDB('127.0.0.1', server.port) as db:
+            result = db.query('SELECT * FROM mydb.users')
+            assert len(result) == 10000
+            assert result[9999] == {'id': '9999', 'name': 'user9999'}
+            assert len(db.query('SELECT * FROM mydb.users')) == 2
+
+    def test_nodelay(self, fake_server):
+        server = fake_server()
+        with CommitDB('127.0.0.1', server.port) as db:
+            assert db._socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+        with CommitDB('127.0.0.1', fake_server().port, nodelay=False) as db:
+            assert db._socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) == 0
+
+    def test_show_databases(self, fake_server):
+        server = fake_server(
+            b'{"success":true,"type":"query","result":{"columns":["Database"],'
+            b'"data":[["app"],["logs"]],"records_read":2,"execution_time_ms":0.1}}\n',
+            b'{"success":true,"type":"query","result":{"columns":["Database"],'
+            b'"data":null,"records_read":0,"execution_time_ms":0.1}}\n'
+        )
+        with CommitDB('127.0.0.1', server.port) as db:
+            assert db.show_databases() == ['app', 'logs']
+            assert db.show_databases() == []
+
+    def test_execute_many(self, fake_server):
+        commit = b'{"success":true,"type":"commit","result":{"records_written":1,"execution_time_ms":0.1}}\n'
+        error = b'{"success":false,"error":"table not found"}\n'
+        server = fake_server(commit, QUERY_REPLY, error, commit, QUERY_REPLY)
+        with CommitDB('127.0.0.1', server.port) as db:
+            results = db.execute_many([
+                "INSERT INTO mydb.users (id, name) VALUES (3, 'Carol')",
+                'SELECT * FROM mydb.users',
+            ])
+            assert results[0].records_written == 1
+            assert len(results[1]) == 2
+
+            with pytest.raises(CommitDBError, match="table not found"):
+                db.execute_many(['SELECT * FROM mydb.missing', "INSERT INTO mydb.users (id) VALUES (4)"])
+            # Responses to the failed batch were drained, so the stream is still in sync
+            assert len(db.query('SELECT * FROM mydb.users')) == 2
+
+    @pytest.mark.parametrize("bad", ["SELECT 'a\nb'", '', '  ', 'QUIT', 'exit'])
+    def test_execute_many_rejects_before_sending(self, fake_server, bad):
+        server = fake_server(QUERY_REPLY)
+        padding = 'x' * (64 * 1024)
+        with CommitDB('127.0.0.1', server.port) as db:
+            with pytest.raises(CommitDBError):
+                # The first query fills a whole window on its own
+                db.execute_many([f"SELECT * FROM mydb.users WHERE name != '{padding}'", bad])
+            assert len(db.query('SELECT * FROM mydb.users')) == 2
+        assert server.queries[0] == 'SELECT * FROM mydb.users'
+
+    def test_execute_many_large_batch(self, fake_server):
+        # Far more query and reply bytes than the socket buffers hold; sending
+        # the whole batch before reading would stall both ends
+        rows = ','.join(f'["{i}","user{i}"]' for i in range(5000))
+        reply = ('{"success":true,"type":"query","result":{"columns":["id","name"],'
+                 f'"data":[{rows}],"records_read":5000,"execution_time_ms":1.0}}}}\n').encode('utf-8')
+        queries = [f"SELECT * FROM mydb.users WHERE name != '{'x' * 16000}'"] * 400
+        server = fake_server(*[reply] * len(queries))
+        db = CommitDB('127.0.0.1', server.port).connect(timeout=5)
+        try:
+            results = db.execute_many(queries)
+        finally:
+            db.close()
+        assert len(results) == 400
+        assert len(results[-1]) == 5000
+
+    def test_commit_response_ignores_unknown_fields(self, fake_server):
+        server = fake_server(
+            b'{"success":true,"type":"commit","result":{"tables_created":1,'
+            b'"execution_time_ms":0.2,"execution_ops":3,"new_server_field":true}}\n'
+        )
+        with CommitDB('127.0.0.1', server.port) as db:
+            result = db.execute('CREATE TABLE mydb.users (id INT PRIMARY KEY)')
+        assert result == CommitResult(tables_created=1, execution_time_ms=0.2, execution_ops=3)
+
+    def test_query_response_missing_fields(self, fake_server):
+        server = fake_server(
+            b'{"success":true,"type":"query","result":{"columns":["id"],"data":[["1"]]}}\n',
+            b'{"success":true,"type":"query"}\n'
+        )
+        with CommitDB('127.0.0.1', server.port) as db:
+            assert db.query('SELECT id FROM mydb.users') == QueryResult(columns=['id'], data=[['1']])
+            assert db.query('SELECT id FROM mydb.empty') == QueryResult()
+
+    def test_share_returns_status_row(self, fake_server):
+        server = fake_server(
+            b'{"success":true,"type":"query","result":{"columns":["Status"],'
+            b'"data":[["Share \'sample\' dropped"]],"records_read":1,"execution_time_ms":3}}\n'
+        )
+        with CommitDB('127.0.0.1', server.port) as db:
+            result = db.drop_share('sample')
+        assert result.column('Status') == ["Share 'sample' dropped"]
+
+    def test_insert_quotes_strings(self, fake_server):
+        commit = b'{"success":true,"type":"commit","result":{"records_written":2,"execution_time_ms":0.1}}\n'
+        server = fake_server(commit, commit)
+        with CommitDB('127.0.0.1', server.port) as db:
+            db.insert('mydb', 'users', ['id', 'name'], [1, "O'Brien"])
+            result = db.insert_many('mydb', 'users', ['id', 'name'], [[2, 'C:\\temp'], [3, "it's"]])
+            assert result.records_written == 2
+        assert server.queries[0] == "INSERT INTO mydb.users (id, name) VALUES (1, 'O''Brien')"
+        assert server.queries[1] == "INSERT INTO mydb.users (id, name) VALUES (2, 'C:\\temp'), (3, 'it''s')"
+
+    def test_socket_options(self, fake_server):
+        def options(db):
+            return [db._socket.getsockopt(socket.SOL_SOCKET, option)
+                    for option in (socket.SO_KEEPALIVE, socket.SO_RCVBUF, socket.SO_SNDBUF)]
+
+        with CommitDB('127.0.0.1', fake_server().port, keepalive=False) as db:
+            keepalive, default_rcvbuf, default_sndbuf = options(db)
+            assert keepalive == 0
+        # The kernel may clamp the size to rmem_max/wmem_max (and Linux doubles
+        # it), so only check that it moved away from what it picks by default
+        size = 192 * 1024
+        with CommitDB('127.0.0.1', fake_server().port, recv_buffer_size=size, send_buffer_size=size) as db:
+            keepalive, rcvbuf, sndbuf = options(db)
+            assert keepalive != 0
+            assert rcvbuf != default_rcvbuf
+            assert sndbuf != default_sndbuf
+
+    def test_invalid_response(self, fake_server):
+        server = fake_server(b'not json\n')
+        with CommitDB('127.0.0.1', server.port) as db:
+            with pytest.raises(CommitDBError, match="Invalid response"):
+                db.execute('SHOW DATABASES')
+
+
+# Integration tests require a running server and are skipped unless pytest
+# is given --run-integration, as CI does after starting the server
 
 import os
-SKIP_INTEGRATION = os.environ.get('COMMITDB_SERVER_URL') is None and os.environ.get('CI') is None
+
+# Statement templates shared by the integration tests; database names are
+# generated per test, so only the name is filled in at call time
+CREATE_DB_SQL = 'CREATE DATABASE {db}'
+CREATE_USERS_SQL = 'CREATE TABLE {db}.users (id INT PRIMARY KEY, name STRING)'
+CREATE_ITEMS_SQL = 'CREATE TABLE {db}.items (id INT PRIMARY KEY, value STRING)'
+INSERT_ITEM_SQL = "INSERT INTO {table} (id, value) VALUES (1, 'hello')"
+SELECT_ALL_SQL = 'SELECT * FROM {table}'
 
 
-@pytest.mark.skipif(SKIP_INTEGRATION, reason="Server not running - set COMMITDB_SERVER_URL or CI env var")
+@pytest.mark.integration
 class TestCommitDBIntegration:
     """Integration tests (requires running server)."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def db(self):
+        # One connection per class; each test uses its own database name
         host = os.environ.get('COMMITDB_HOST', 'localhost')
         port = int(os.environ.get('COMMITDB_PORT', '3306'))
         db = CommitDB(host, port)
@@ -109,24 +420,38 @@ class TestCommitDBIntegration:
         yield db
         db.close()
 
-    def test_create_database(self, db):
-        result = db.execute('CREATE DATABASE pytest_int_test1')
-        assert isinstance(result, CommitResult)
+    @pytest.fixture
+    def db_name(self):
+        # Unique per test so reruns against a persistent server don't collide
+        return f'pytest_int_{uuid.uuid4().hex[:8]}'
+
+    @pytest.fixture(scope="class")
+    def items_table(self, db):
+        # Schema is created once per class; tests only insert and select
+        name = f'pytest_int_{uuid.uuid4().hex[:8]}'
+        db.execute_many([
+            CREATE_DB_SQL.format(db=name),
+            CREATE_ITEMS_SQL.format(db=name),
+        ])
+        return f'{name}.items'
+
+    def test_execute_returns_commit_result(self, db, db_name):
+        assert isinstance(db.execute(CREATE_DB_SQL.format(db=db_name)), CommitResult)
+        assert isinstance(db.query('SHOW DATABASES'), QueryResult)
+
+    def test_create_database(self, db, db_name):
+        result = db.execute(CREATE_DB_SQL.format(db=db_name))
         assert result.databases_created == 1
 
-    def test_create_table(self, db):
-        db.execute('CREATE DATABASE pytest_int_test2')
-        result = db.execute('CREATE TABLE pytest_int_test2.users (id INT PRIMARY KEY, name STRING)')
-        assert isinstance(result, CommitResult)
+    def test_create_table(self, db, db_name):
+        db.execute(CREATE_DB_SQL.format(db=db_name))
+        result = db.execute(CREATE_USERS_SQL.format(db=db_name))
         assert result.tables_created == 1
 
-    def test_insert_and_query(self, db):
-        db.execute('CREATE DATABASE pytest_int_test3')
-        db.execute('CREATE TABLE pytest_int_test3.items (id INT PRIMARY KEY, value STRING)')
-        db.execute("INSERT INTO pytest_int_test3.items (id, value) VALUES (1, 'hello')")
+    def test_insert_and_query(self, db, items_table):
+        db.execute(INSERT_ITEM_SQL.format(table=items_table))
 
-        result = db.query('SELECT * FROM pytest_int_test3.items')
-        assert isinstance(result, QueryResult)
+        result = db.query(SELECT_ALL_SQL.format(table=items_table))
         assert len(result) == 1
         assert result[0] == {'id': '1', 'value': 'hello'}
 
@@ -228,14 +553,14 @@ from pathlib import Path
 # Try to find the shared library
 def _find_lib():
     # Path: clients/python/tests/test_client.py -> repo root is 4 levels up
-    repo_root = Path(__file__).parent.parent.parent.parent
-    lib_paths = [
-        repo_root / 'lib' / 'libcommitdb.dylib',
-        repo_root / 'lib' / 'libcommitdb.so',
-    ]
-    for p in lib_paths:
-        if p.exists():
-            return str(p)
+    lib_dir = Path(__file__).resolve().parents[3] / 'lib'
+    try:
+        entries = set(os.listdir(lib_dir))
+    except OSError:
+        return None
+    for name in ('libcommitdb.dylib', 'libcommitdb.so'):
+        if name in entries:
+            return str(lib_dir / name)
     return None
 
 LIB_PATH = _find_lib()
@@ -314,6 +639,25 @@ class TestCommitDBLocal:
         assert len(result) == 1
         assert result[0] == {'id': '1', 'name': 'Alice'}
 
+    def test_insert_many(self, db):
+        db.create_database('local_test8')
+        db.create_table('local_test8', 'users', 'id INT PRIMARY KEY, name STRING')
+        result = db.insert_many('local_test8', 'users', ['id', 'name'], [[1, "O'Brien"], [2, 'Bob']])
+        assert result.records_written == 2
+
+        result = db.query('SELECT * FROM local_test8.users ORDER BY id ASC')
+        assert result[0] == {'id': '1', 'name': "O'Brien"}
+
+    def test_execute_many_runs_all(self, db):
+        db.execute('CREATE DATABASE local_test9')
+        with pytest.raises(CommitDBError):
+            db.execute_many([
+                'SELECT * FROM local_test9.missing',
+                'CREATE TABLE local_test9.users (id INT PRIMARY KEY)',
+            ])
+        # The query after the failing one still ran
+        assert db.query('SHOW TABLES IN local_test9').column(0) == ['users']
+
     def test_error_handling(self, db):
         with pytest.raises(CommitDBError):
             db.query('SELECT * FROM nonexistent.table')
@@ -2,43 +2,56 @@
 
 import pytest
 
-# Skip all tests if ibis is not installed
-ibis = pytest.importorskip("ibis")
-pd = pytest.importorskip("pandas")
+
+@pytest.fixture(scope="module")
+def ibis_backend():
+    """The commitdb.ibis_backend module, imported once per test module.
+
+    Tests that need ibis request this fixture, so they are skipped when
+    ibis is not installed while the rest of the module still runs.
+    """
+    pytest.importorskip("ibis")
+    from commitdb import ibis_backend
+    return ibis_backend
+
+
+@pytest.fixture(scope="module")
+def dt(ibis_backend):
+    """ibis.expr.datatypes, imported once per test module."""
+    import ibis.expr.datatypes as dt
+    return dt
+
+
+@pytest.fixture(scope="module")
+def backend(ibis_backend):
+    """An unconnected Backend shared by the unit tests."""
+    return ibis_backend.Backend()
 
 
 class TestIbisBackendUnit:
     """Unit tests for ibis backend that don't require a server."""
     
-    def test_import_backend(self):
+    def test_import_backend(self, ibis_backend):
         """Test that the backend can be imported."""
-        from commitdb import ibis_backend
-        assert hasattr(ibis_backend, "Backend")
+        from commitdb.ibis_backend import Backend
+        assert Backend is not None
     
-    def test_backend_registered(self):
+    def test_backend_registered(self, all_entry_points):
         """Test that the backend is registered via entry points."""
-        from importlib.metadata import entry_points
-        
         # Check entry points registration
-        eps = entry_points(group='ibis.backends')
-        names = [ep.name for ep in eps]
-        assert 'commitdb' in names
+        eps = all_entry_points.select(group='ibis.backends')
+        assert 'commitdb' in eps.names
     
-    def test_type_mapping(self):
+    def test_type_mapping(self, ibis_backend, dt):
         """Test CommitDB to Ibis type mapping."""
-        from commitdb.ibis_backend import COMMITDB_TYPE_MAP
-        import ibis.expr.datatypes as dt
-        
-        assert COMMITDB_TYPE_MAP["INT"] == dt.Int64
-        assert COMMITDB_TYPE_MAP["STRING"] == dt.String
-        assert COMMITDB_TYPE_MAP["FLOAT"] == dt.Float64
-        assert COMMITDB_TYPE_MAP["BOOL"] == dt.Boolean
+        type_map = ibis_backend.COMMITDB_TYPE_MAP
+        assert type_map["INT"] == dt.Int64
+        assert type_map["STRING"] == dt.String
+        assert type_map["FLOAT"] == dt.Float64
+        assert type_map["BOOL"] == dt.Boolean
     
-    def test_backend_instantiation(self):
+    def test_backend_instantiation(self, backend):
         """Test that the backend can be instantiated."""
-        from commitdb.ibis_backend import Backend
-        
-        backend = Backend()
         assert backend.name == "commitdb"
         assert backend._client is None
 
@@ -47,15 +60,13 @@ class TestIbisBackendUnit:
 class TestIbisBackendIntegration:
     """Integration tests that require a running CommitDB server.
     
-    Run with: pytest -m integration tests/test_ibis.py
+    Run with: pytest --run-integration tests/test_ibis.py
     """
     
     @pytest.fixture
-    def connection(self):
+    def connection(self, ibis_backend):
         """Create a connection to the test server."""
-        from commitdb.ibis_backend import Backend
-        
-        backend = Backend()
+        backend = ibis_backend.Backend()
         try:
             backend.do_connect(host="localhost", port=3306, database="test")
             yield backend
@@ -73,6 +84,7 @@ class TestIbisBackendIntegration:
     
     def test_query_to_dataframe(self, connection):
         """Test that queries return pandas DataFrames."""
+        pd = pytest.importorskip("pandas")
         from commitdb.client import CommitDBError
         
         # Setup: create database (ignore if exists)
@@ -47,6 +47,8 @@ type AuthResponse struct {
 }
 
 // EncodeResponse serializes a Response to JSON with a newline.
+// json.Marshal escapes control characters inside strings, so the trailing
+// newline is the only one in the frame and clients can split on it.
 func EncodeResponse(resp Response) ([]byte, error) {
 	data, err := json.Marshal(resp)
 	if err != nil {
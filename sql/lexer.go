@@ -1,5 +1,7 @@
 package sql
 
+import "strings"
+
 type Token struct {
 	Type  TokenType
 	Value string
@@ -394,13 +396,32 @@ func (lexer *Lexer) readIdentifier() string {
 func (lexer *Lexer) readString() string {
 	lexer.readChar() // skip opening quote
 	position := lexer.position
-	for lexer.ch != '\'' && lexer.ch != 0 {
+	escaped := false
+	for lexer.ch != 0 {
+		if lexer.ch == '\'' {
+			// A doubled quote ('') is a literal quote, anything else ends the string
+			if lexer.peekChar() != '\'' {
+				break
+			}
+			escaped = true
+			lexer.readChar()
+		}
 		lexer.readChar()
 	}
 	str := lexer.sql[position:lexer.position]
+	if escaped {
+		str = strings.ReplaceAll(str, "''", "'")
+	}
 	return str
 }
 
+func (lexer *Lexer) peekChar() byte {
+	if lexer.readPosition >= len(lexer.sql) {
+		return 0
+	}
+	return lexer.sql[lexer.readPosition]
+}
+
 func (lexer *Lexer) readNumber() string {
 	position := lexer.position
 	for isDigit(lexer.ch) {
@@ -148,6 +148,25 @@ func TestLexer(t *testing.T) {
 				{EOF, ""},
 			},
 		},
+		{
+			"insert escaped quote",
+			"INSERT INTO test (col_1) VALUES ('it''s', '')",
+			[]Token{
+				{Insert, "INSERT"},
+				{Into, "INTO"},
+				{Identifier, "test"},
+				{ParenOpen, "("},
+				{Identifier, "col_1"},
+				{ParenClose, ")"},
+				{Values, "VALUES"},
+				{ParenOpen, "("},
+				{String, "it's"},
+				{Comma, ","},
+				{String, ""},
+				{ParenClose, ")"},
+				{EOF, ""},
+			},
+		},
 		{
 			"drop table",
 			"DROP TABLE test",